@@ -1,125 +1,161 @@
 """Absolute Humidity Sensor class."""
-from homeassistant.helpers.entity import Entity
-import math
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
 import logging
 
+from .calculation import calculate_absolute_humidity
+from .const import DOMAIN, INVALID_STATES, SIGNAL_ABS_SENSOR_ADDED
+
 _LOGGER = logging.getLogger(__name__)
 
+def _source_name(hass, entity_id):
+    """Return a display name for a source entity, even if it has no state yet."""
+    entry = er.async_get(hass).async_get(entity_id)
+    # Entities using has_entity_name are only named properly together with their device
+    if entry and not entry.has_entity_name and (entry.name or entry.original_name):
+        return entry.name or entry.original_name
+    state = hass.states.get(entity_id)
+    if state:
+        return state.attributes.get('friendly_name', entity_id)
+    return entity_id
+
 
-class AbsoluteHumiditySensor(Entity):
+class AbsoluteHumiditySensor(SensorEntity):
     """Representation of an Absolute Humidity sensor."""
     
+    # Entity itself has no __slots__, so this only covers our own attributes;
+    # the _attr_* values are managed by Home Assistant's cached properties
+    __slots__ = (
+        "_hass",
+        "_humidity_entity_id",
+        "_temperature_entity_id",
+        "_humidity_state",
+        "_temperature_state",
+    )
+    
+    # Updated from source state changes instead of polling
+    _attr_should_poll = False
+    _attr_native_unit_of_measurement = "g/m³"
+    # The humidity device class only allows %, so use absolute humidity where HA has it
+    _attr_device_class = getattr(SensorDeviceClass, "ABSOLUTE_HUMIDITY", None)
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:water-percent"
+    
     def __init__(self, hass, humidity_entity_id, temperature_entity_id):
         self._hass = hass
         self._humidity_entity_id = humidity_entity_id
         self._temperature_entity_id = temperature_entity_id
-        self._state = None
+        self._attr_native_value = None
+        self._attr_available = False
+        
+        # Last known source states, taken from the state change events
+        self._humidity_state = None
+        self._temperature_state = None
         
         # Create a more user-friendly name
-        humidity_name = hass.states.get(humidity_entity_id).attributes.get('friendly_name', humidity_entity_id)
-        self._name = f"{humidity_name.replace('Humidity', '').strip()} Absolute Humidity"
-        self._unique_id = f"absolute_humidity_{humidity_entity_id}"
+        humidity_name = _source_name(hass, humidity_entity_id)
+        self._attr_name = f"{humidity_name.replace('Humidity', '').strip()} Absolute Humidity"
+        self._attr_unique_id = f"absolute_humidity_{humidity_entity_id}"
+        self._attr_extra_state_attributes = {
+            "source_humidity": humidity_entity_id,
+            "source_temperature": temperature_entity_id,
+        }
         
-        _LOGGER.debug(f"Initialized AbsoluteHumiditySensor with humidity: {humidity_entity_id}, temperature: {temperature_entity_id}")
+        _LOGGER.debug("Initialized AbsoluteHumiditySensor with humidity: %s, temperature: %s", humidity_entity_id, temperature_entity_id)
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self._name
-    
-    @property
-    def unique_id(self):
-        """Return a unique ID for this sensor."""
-        return self._unique_id
+    async def async_added_to_hass(self):
+        """Subscribe to the source sensors and calculate the initial state."""
+        self.async_on_remove(
+            async_track_state_change_event(
+                self._hass,
+                [self._humidity_entity_id, self._temperature_entity_id],
+                self._async_source_changed,
+            )
+        )
+        self._humidity_state = self._hass.states.get(self._humidity_entity_id)
+        self._temperature_state = self._hass.states.get(self._temperature_entity_id)
+        self._update_state()
+        
+        domain_data = self._hass.data.setdefault(DOMAIN, {})
+        # Renaming the entity id removes and re-adds this sensor, so claim the humidity sensor again
+        domain_data.setdefault("created", set()).add(self._humidity_entity_id)
+        # Let window sensors look this sensor up by its source humidity sensor
+        domain_data.setdefault("abs_sensors", {})[self._humidity_entity_id] = self.entity_id
+        async_dispatcher_send(self._hass, SIGNAL_ABS_SENSOR_ADDED, self._humidity_entity_id)
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+    async def async_will_remove_from_hass(self):
+        """Allow the humidity sensor to be discovered again once this sensor is gone."""
+        domain_data = self._hass.data.get(DOMAIN, {})
+        domain_data.get("created", set()).discard(self._humidity_entity_id)
+        abs_sensors = domain_data.get("abs_sensors", {})
+        if abs_sensors.get(self._humidity_entity_id) == self.entity_id:
+            del abs_sensors[self._humidity_entity_id]
 
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement."""
-        return "g/m³"
-    
-    @property
-    def device_class(self):
-        """Return the device class."""
-        return "humidity"
-    
-    @property
-    def state_class(self):
-        """Return the state class."""
-        return "measurement"
-    
-    @property
-    def icon(self):
-        """Return the icon for the sensor."""
-        return "mdi:water-percent"
-    
-    @property
-    def extra_state_attributes(self):
-        """Return additional state attributes."""
-        return {
-            "source_humidity": self._humidity_entity_id,
-            "source_temperature": self._temperature_entity_id,
-        }
-    
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        humidity_state = self._hass.states.get(self._humidity_entity_id)
-        temperature_state = self._hass.states.get(self._temperature_entity_id)
-        return (humidity_state is not None and 
-                temperature_state is not None and
-                humidity_state.state not in ['unknown', 'unavailable'] and
-                temperature_state.state not in ['unknown', 'unavailable'])
+    @callback
+    def _async_source_changed(self, event):
+        """Recalculate when the humidity or temperature sensor changes."""
+        # Only the source that fired changed, so take its state from the event
+        data = event.data
+        if data["entity_id"] == self._humidity_entity_id:
+            self._humidity_state = data["new_state"]
+        else:
+            self._temperature_state = data["new_state"]
+        
+        previous = (self._attr_native_value, self._attr_available)
+        self._update_state()
+        if (self._attr_native_value, self._attr_available) != previous:
+            self.async_write_ha_state()
 
-    async def async_update(self):
-        """Update the sensor state."""
-        _LOGGER.debug(f"Updating absolute humidity sensor {self._name}")
-        humidity = self._hass.states.get(self._humidity_entity_id)
-        temperature = self._hass.states.get(self._temperature_entity_id)
+    def _update_state(self):
+        """Update the sensor state from the cached source states."""
+        _LOGGER.debug("Updating absolute humidity sensor %s", self._attr_name)
+        humidity = self._humidity_state
+        temperature = self._temperature_state
+        self._attr_available = (humidity is not None and 
+                                temperature is not None and
+                                humidity.state not in INVALID_STATES and
+                                temperature.state not in INVALID_STATES)
 
         if humidity is None:
-            _LOGGER.warning(f"Humidity entity {self._humidity_entity_id} state is None")
+            _LOGGER.warning("Humidity entity %s state is None", self._humidity_entity_id)
             return
         
         if temperature is None:
-            _LOGGER.warning(f"Temperature entity {self._temperature_entity_id} state is None")
+            _LOGGER.warning("Temperature entity %s state is None", self._temperature_entity_id)
             return
         
         # Check if states are valid
-        if humidity.state in ['unknown', 'unavailable']:
-            _LOGGER.debug(f"Humidity entity {self._humidity_entity_id} is {humidity.state}")
+        if humidity.state in INVALID_STATES:
+            _LOGGER.debug("Humidity entity %s is %s", self._humidity_entity_id, humidity.state)
             return
             
-        if temperature.state in ['unknown', 'unavailable']:
-            _LOGGER.debug(f"Temperature entity {self._temperature_entity_id} is {temperature.state}")
+        if temperature.state in INVALID_STATES:
+            _LOGGER.debug("Temperature entity %s is %s", self._temperature_entity_id, temperature.state)
             return
 
         try:
             rh = float(humidity.state)
             temp_c = float(temperature.state)
-            
-            # Validate ranges
-            if not 0 <= rh <= 100:
-                _LOGGER.warning(f"Humidity value {rh}% is out of valid range (0-100%) for {self._name}")
-                return
-                
-            if not -40 <= temp_c <= 80:
-                _LOGGER.warning(f"Temperature value {temp_c}°C is out of reasonable range (-40 to 80°C) for {self._name}")
-                return
-            
-            # Calculate absolute humidity using Magnus formula
-            saturation_vapor_pressure = 6.112 * math.exp((17.67 * temp_c) / (temp_c + 243.5))
-            ah = (saturation_vapor_pressure * rh * 2.1674) / (273.15 + temp_c)
-            self._state = round(ah, 2)
-            
-            _LOGGER.debug(f"Calculated absolute humidity for {self._name} RH={rh}%, T={temp_c}°C {self._state} g/m³")
         except ValueError as e:
-            _LOGGER.error(f"Invalid sensor values for {self._name} - humidity: {humidity.state}, temperature: {temperature.state}: {e}")
-            self._state = None
-        except Exception as e:
-            _LOGGER.error(f"Error updating absolute humidity sensor {self._name}: {e}")
-            self._state = None
+            _LOGGER.error("Invalid sensor values for %s - humidity: %s, temperature: %s: %s", self._attr_name, humidity.state, temperature.state, e)
+            self._attr_native_value = None
+            return
+        
+        # Validate ranges
+        if not (0.0 <= rh <= 100.0 and -40.0 <= temp_c <= 80.0):
+            _LOGGER.warning("Sensor values out of range (0-100%% RH, -40 to 80°C) for %s: %s%%, %s°C", self._attr_name, rh, temp_c)
+            return
+        
+        # Calculate absolute humidity using Magnus formula
+        new_state = round(calculate_absolute_humidity(temp_c, rh), 2)
+        
+        # Nothing to do if the rounded value did not change
+        if new_state == self._attr_native_value:
+            return
+        
+        self._attr_native_value = new_state
+        
+        _LOGGER.debug("Calculated absolute humidity for %s RH=%s%%, T=%s°C %s g/m³", self._attr_name, rh, temp_c, new_state)
@@ -0,0 +1,15 @@
+"""Absolute humidity calculation for the Absolute Humidity integration."""
+import math
+
+# Magnus formula constants, with the saturation vapor pressure and
+# absolute humidity factors folded into a single coefficient
+_EXP = math.exp
+_A = 17.67
+_B = 243.5
+_K = 273.15
+_COEFF = 6.112 * 2.1674
+
+
+def calculate_absolute_humidity(temp_c, rh):
+    """Return the absolute humidity in g/m³ for a temperature in °C and relative humidity in %."""
+    return _COEFF * rh * _EXP(_A * temp_c / (temp_c + _B)) / (_K + temp_c)
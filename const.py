@@ -1,10 +1,15 @@
 """Constants for the Absolute Humidity integration."""
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 
 DOMAIN = "absolute_humidity"
 
+# Source states that cannot be used in a calculation
+INVALID_STATES = frozenset({STATE_UNKNOWN, STATE_UNAVAILABLE})
+
 # Dispatcher signals
 SIGNAL_ADD_SENSOR = "absolute_humidity_add_sensor"
 SIGNAL_ADD_WINDOW_SENSOR = "absolute_humidity_add_window_sensor"
+SIGNAL_ABS_SENSOR_ADDED = "absolute_humidity_abs_sensor_added"
 
 # Window recommendation states
 WINDOW_STATE_TOO_WET = "too wet"
@@ -1,27 +1,106 @@
 """Discovery system for Absolute Humidity sensors."""
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_state_added_domain
 from homeassistant.core import callback, Event
+import asyncio
+import functools
 import logging
+import re
 
-from .const import SIGNAL_ADD_SENSOR, SIGNAL_ADD_WINDOW_SENSOR, DEFAULT_TEMPERATURE_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL
+from .const import DOMAIN, SIGNAL_ADD_SENSOR, SIGNAL_ADD_WINDOW_SENSOR, DEFAULT_TEMPERATURE_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL
 from .absolute_humidity_sensor import AbsoluteHumiditySensor
 from .window_recommendation_sensor import WindowRecommendationSensor
 
 _LOGGER = logging.getLogger(__name__)
 
+# Common patterns for outdoor sensors
+_OUTDOOR_RE = re.compile(r"outdoor|outside|exterior|external|weather|yard|garden|patio|deck|balcony")
+
+
+def _is_outdoor_sensor(entity_id, state):
+    """Return True if the entity id or friendly name looks like an outdoor sensor."""
+    return bool(_OUTDOOR_RE.search(entity_id.lower())
+                or _OUTDOOR_RE.search(state.attributes.get('friendly_name', '').lower()))
+
+
+def _sensor_device_class(entry, state):
+    """Return a sensor's device class from its registry entry, falling back to its state."""
+    # Customized device classes only show up in the state attributes
+    device_class = entry and (entry.device_class or entry.original_device_class)
+    if not device_class and state is not None:
+        device_class = state.attributes.get('device_class')
+    return device_class
+
+
+def _is_self_generated(hass, entity_id):
+    """Return True if the entity is one of our own sensors."""
+    # Entity ids can be renamed or de-duplicated by HA, so go by the owning platform
+    entry = er.async_get(hass).async_get(entity_id)
+    if entry is not None:
+        return entry.platform == DOMAIN
+    state = hass.states.get(entity_id)
+    return state is not None and 'source_humidity' in state.attributes
+
+
+# Splits 'sensor.{base}_{suffix}' for the suffixes used to pair sensors
+_BASE_NAME_RE = re.compile(r"(?:sensor\.)?(?P<base>.+)_(?P<suffix>humidity|temperature|temp)")
+
+
+def _sensor_base_name(entity_id):
+    """Return the base name and pairing suffix of an entity id, or (None, None)."""
+    match = _BASE_NAME_RE.fullmatch(entity_id)
+    if match is None:
+        return None, None
+    return match.group('base', 'suffix')
+
+
+@functools.lru_cache(maxsize=1024)
+def _candidate_temp_ids(humidity_entity_id):
+    """Return the temperature entity ids to probe for a humidity sensor, in order of preference."""
+    patterns = (
+        # Pattern 1: replace '_humidity' with '_temperature'
+        humidity_entity_id.replace('_humidity', '_temperature'),
+        # Pattern 2: replace 'humidity' with 'temperature' anywhere
+        humidity_entity_id.replace('humidity', 'temperature'),
+        # Pattern 3: same base name + '_temp' instead of '_humidity'
+        humidity_entity_id.replace('_humidity', '_temp'),
+        # Pattern 4: same base name + '_temperature' (removing last part)
+        f"{humidity_entity_id.rsplit('_', 1)[0]}_temperature",
+        # Pattern 5: same base name + '_temp' (removing last part)
+        f"{humidity_entity_id.rsplit('_', 1)[0]}_temp",
+        # Pattern 6: same base name without suffix
+        humidity_entity_id.replace('_humidity', ''),
+        # Pattern 7: same base without the suffix and without starting sensor_
+        humidity_entity_id.replace('sensor_', '').replace('_humidity', ''),
+    )
+    # Several patterns often coincide, keep each candidate once in its original order
+    return tuple(p for p in dict.fromkeys(patterns) if p != humidity_entity_id)
+
 
 class AbsoluteHumidityDiscovery:
     """Handles dynamic discovery of humidity/temperature sensor pairs."""
     
-    def __init__(self, hass, async_add_entities, config=None):
+    def __init__(self, hass, async_add_entities, config=None, created_sensors=None):
         self._hass = hass
         self._async_add_entities = async_add_entities
-        self._created_sensors = set()
+        # Humidity entity ids with an absolute humidity sensor, shared between platform setups
+        self._created_sensors = created_sensors if created_sensors is not None else set()
         self._created_window_sensors = set()
+        self._pending_humidity_sensors = set()
+        self._humidity_index = set()
+        self._temperature_sensors = set()
+        self._discover_lock = asyncio.Lock()
+        self._outdoor_cache = None
+        self._temp_index = {}
         self._unsub_dispatcher = None
         self._unsub_window_dispatcher = None
         self._unsub_state_listener = None
+        self._unsub_registry_listener = None
+        self._reevaluate_debouncer = None
+        self._pending_entities = []
+        self._unsub_flush = None
         self._config = config or {}
         
         # Get configured outdoor sensors
@@ -35,9 +114,19 @@ class AbsoluteHumidityDiscovery:
     
     async def async_setup(self):
         """Set up the discovery system."""
-        # Initial discovery of existing entities
+        # Index humidity and temperature sensors, then do the initial discovery
+        self._build_sensor_index()
         await self._discover_existing_entities()
         
+        # Coalesce bursts of new outdoor sensors into a single re-evaluation
+        self._reevaluate_debouncer = Debouncer(
+            self._hass,
+            _LOGGER,
+            cooldown=5.0,
+            immediate=True,
+            function=self._reevaluate_window_sensors,
+        )
+        
         # Set up dispatcher for manual sensor addition
         self._unsub_dispatcher = async_dispatcher_connect(
             self._hass, SIGNAL_ADD_SENSOR, self._async_add_sensor
@@ -48,9 +137,14 @@ class AbsoluteHumidityDiscovery:
             self._hass, SIGNAL_ADD_WINDOW_SENSOR, self._async_add_window_sensor
         )
         
-        # Listen for state changes to detect new entities
-        self._unsub_state_listener = self._hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self._async_state_changed_listener
+        # Listen for newly added sensor entities
+        self._unsub_state_listener = async_track_state_added_domain(
+            self._hass, "sensor", self._async_sensor_added
+        )
+        
+        # Keep the humidity index in sync with the entity registry
+        self._unsub_registry_listener = self._hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
         )
         
         _LOGGER.info("Absolute humidity discovery system initialized")
@@ -63,58 +157,155 @@ class AbsoluteHumidityDiscovery:
             self._unsub_window_dispatcher()
         if self._unsub_state_listener:
             self._unsub_state_listener()
+        if self._unsub_registry_listener:
+            self._unsub_registry_listener()
+        if self._reevaluate_debouncer:
+            self._reevaluate_debouncer.async_cancel()
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
     
-    async def _discover_existing_entities(self):
-        """Discover existing humidity/temperature sensor pairs."""
-        sensors = []
-        
-        for entity_id in self._hass.states.async_entity_ids('sensor'):
-            state = self._hass.states.get(entity_id)
-            _LOGGER.debug(f"Checking entity {entity_id} with state {state}")
-            if state is None:
+    def _build_sensor_index(self):
+        """Index humidity and temperature sensors from the entity registry."""
+        registry = er.async_get(self._hass)
+        states_get = self._hass.states.get
+        index_humidity = self._humidity_index.add
+        index_temperature = self._index_temperature_sensor
+        for entry in registry.entities.values():
+            if entry.domain != 'sensor':
                 continue
-            # Skip self-generated absolute humidity sensors to avoid recursive discovery
-            if entity_id.startswith('sensor.absolute_humidity_'):
-                _LOGGER.debug(f"Skipping self-generated absolute humidity sensor: {entity_id}")
+            device_class = _sensor_device_class(entry, states_get(entry.entity_id))
+            if device_class == 'humidity':
+                index_humidity(entry.entity_id)
+            elif device_class == 'temperature':
+                index_temperature(entry.entity_id)
+        
+        # Entities without a unique_id never reach the registry, fall back to their state
+        for state in self._hass.states.async_all('sensor'):
+            if state.entity_id in registry.entities:
                 continue
-            if state.attributes.get('device_class') == 'humidity':
-                result = await self._try_create_sensor(entity_id)
+            device_class = _sensor_device_class(None, state)
+            if device_class == 'humidity':
+                index_humidity(state.entity_id)
+            elif device_class == 'temperature':
+                index_temperature(state.entity_id)
+    
+    @callback
+    def _async_registry_updated(self, event: Event):
+        """Update the sensor indexes when a sensor registry entry changes."""
+        entity_id = event.data["entity_id"]
+        if not entity_id.startswith('sensor.'):
+            return
+        
+        old_entity_id = event.data.get("old_entity_id")
+        if old_entity_id:
+            self._humidity_index.discard(old_entity_id)
+            self._temperature_sensors.discard(old_entity_id)
+        
+        entry = er.async_get(self._hass).async_get(entity_id)
+        device_class = _sensor_device_class(entry, self._hass.states.get(entity_id))
+        if device_class == 'humidity':
+            self._humidity_index.add(entity_id)
+        else:
+            self._humidity_index.discard(entity_id)
+        if device_class == 'temperature':
+            self._index_temperature_sensor(entity_id)
+        else:
+            self._temperature_sensors.discard(entity_id)
+    
+    async def _discover_existing_entities(self):
+        """Discover existing humidity/temperature sensor pairs."""
+        # Setup and the rediscover service may overlap; serialize them so pairs are not created twice
+        async with self._discover_lock:
+            self._outdoor_cache = None
+            candidates = []
+            created_sensors = self._created_sensors
+            states_get = self._hass.states.get
+            
+            for entity_id in self._humidity_index:
+                # Skip self-generated sensors to avoid recursive discovery
+                if _is_self_generated(self._hass, entity_id):
+                    _LOGGER.debug("Skipping self-generated sensor: %s", entity_id)
+                    continue
+                # Registry entries may belong to entities that are not loaded
+                if entity_id not in created_sensors and states_get(entity_id):
+                    candidates.append(entity_id)
+            
+            # Candidates are independent of each other, so try them concurrently
+            results = await asyncio.gather(
+                *(self._try_create_sensor(entity_id) for entity_id in candidates)
+            )
+            
+            sensors = []
+            for result in results:
                 if result:
                     if isinstance(result, list):
                         sensors.extend(result)
                     else:
                         sensors.append(result)
-        
-        if sensors:
-            _LOGGER.info(f"Discovered {len(sensors)} sensors (absolute humidity and window recommendation sensors)")
-            self._async_add_entities(sensors, True)
+            
+            if sensors:
+                _LOGGER.info("Discovered %s sensors (absolute humidity and window recommendation sensors)", len(sensors))
+                self._async_add_entities(sensors)
     
     @callback
-    def _async_state_changed_listener(self, event: Event):
-        """Listen for state changes that might indicate new entities."""
-        entity_id = event.data.get("entity_id")
-        new_state = event.data.get("new_state")
-        
-        if not entity_id or not new_state:
+    def _async_sensor_added(self, event: Event):
+        """Handle a sensor entity being added to the state machine."""
+        data = event.data
+        entity_id = data["entity_id"]
+        new_state = data["new_state"]
+        entry = er.async_get(self._hass).async_get(entity_id)
+        handler = _DC_DISPATCH.get(_sensor_device_class(entry, new_state))
+        if handler is None:
+            # Configured outdoor sensors are used even without a device class
+            if entity_id in (self._outdoor_temperature_sensor, self._outdoor_humidity_sensor):
+                self._outdoor_cache = None
+                self._schedule_reevaluation('configured', entity_id)
+            return
+        handler(self, entity_id, new_state)
+    
+    @callback
+    def _handle_humidity_added(self, entity_id, new_state):
+        """Handle a new humidity sensor."""
+        # Skip self-generated sensors to avoid recursive discovery
+        if _is_self_generated(self._hass, entity_id):
+            _LOGGER.debug("Skipping self-generated sensor: %s", entity_id)
             return
         
-        # Process sensor entities with humidity or temperature device class
-        if entity_id.startswith("sensor."):
-            device_class = new_state.attributes.get('device_class')
-            
-            if device_class == 'humidity':
-                # Skip self-generated absolute humidity sensors to avoid recursive discovery
-                if entity_id.startswith('sensor.absolute_humidity_'):
-                    _LOGGER.debug(f"Skipping self-generated absolute humidity sensor: {entity_id}")
-                    return
-                
-                # Handle both indoor humidity sensors (for absolute humidity) and outdoor humidity sensors (for window recommendations)
-                self._hass.async_create_task(self._async_handle_new_humidity_entity(entity_id))
-                self._hass.async_create_task(self._check_and_handle_outdoor_sensor(entity_id, 'humidity'))
-                
-            elif device_class == 'temperature':
-                # Check if this might be an outdoor temperature sensor and trigger window sensor re-evaluation
-                self._hass.async_create_task(self._check_and_handle_outdoor_sensor(entity_id, 'temperature'))
+        self._humidity_index.add(entity_id)
+        is_outdoor = self._outdoor_sensor_added(entity_id, new_state)
+        if entity_id not in self._created_sensors:
+            self._hass.async_create_task(self._async_handle_new_humidity_entity(entity_id))
+        if is_outdoor:
+            self._schedule_reevaluation('humidity', entity_id)
+    
+    @callback
+    def _handle_temperature_added(self, entity_id, new_state):
+        """Handle a new temperature sensor."""
+        is_outdoor = self._outdoor_sensor_added(entity_id, new_state)
+        self._index_temperature_sensor(entity_id)
+        if self._pending_humidity_sensors:
+            # A new temperature sensor may complete a pending pair
+            self._hass.async_create_task(self._async_handle_new_temperature_entity(entity_id))
+        if is_outdoor:
+            self._schedule_reevaluation('temperature', entity_id)
+    
+    @callback
+    def _outdoor_sensor_added(self, entity_id, new_state):
+        """Return True and drop the outdoor cache if a new sensor may change the outdoor pair."""
+        is_outdoor = (
+            entity_id in (self._outdoor_temperature_sensor, self._outdoor_humidity_sensor)
+            or _is_outdoor_sensor(entity_id, new_state)
+        )
+        if is_outdoor:
+            self._outdoor_cache = None
+        return is_outdoor
+    
+    @callback
+    def _schedule_reevaluation(self, device_class, entity_id):
+        """Re-evaluate existing indoor sensors for window recommendation creation."""
+        _LOGGER.debug("New outdoor %s sensor detected: %s", device_class, entity_id)
+        self._reevaluate_debouncer.async_schedule_call()
     
     async def _async_handle_new_humidity_entity(self, humidity_entity_id):
         """Handle discovery of a new humidity entity."""
@@ -125,46 +316,39 @@ class AbsoluteHumidityDiscovery:
         if result:
             if isinstance(result, list):
                 sensor_names = [sensor.name for sensor in result]
-                _LOGGER.info(f"Dynamically discovered new sensors: {', '.join(sensor_names)}")
-                self._async_add_entities(result, True)
+                _LOGGER.info("Dynamically discovered new sensors: %s", ', '.join(sensor_names))
+                self._queue_entities(result)
             else:
-                _LOGGER.info(f"Dynamically discovered new absolute humidity sensor: {result.name}")
-                self._async_add_entities([result], True)
+                _LOGGER.info("Dynamically discovered new absolute humidity sensor: %s", result.name)
+                self._queue_entities([result])
     
-    async def _async_handle_new_temperature_entity(self, temperature_entity_id):
-        """Handle discovery of a new temperature entity that might enable window sensors."""
-        # Check if this looks like an outdoor temperature sensor
-        await self._check_and_handle_outdoor_sensor(temperature_entity_id, 'temperature')
+    @callback
+    def _queue_entities(self, entities):
+        """Queue dynamically discovered entities so a burst is added in one call."""
+        self._pending_entities.extend(entities)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self._hass, 0.1, self._async_flush_entities)
     
-    async def _check_and_handle_outdoor_sensor(self, entity_id, sensor_type):
-        """Check if an entity is an outdoor sensor and handle accordingly."""
-        entity_lower = entity_id.lower()
-        sensor_state = self._hass.states.get(entity_id)
-        if not sensor_state:
-            return
-            
-        name_lower = sensor_state.attributes.get('friendly_name', '').lower()
-        
-        # Common patterns for outdoor sensors
-        outdoor_patterns = [
-            'outdoor', 'outside', 'exterior', 'external', 'weather', 
-            'yard', 'garden', 'patio', 'deck', 'balcony'
-        ]
-        
-        # Check if this looks like an outdoor sensor
-        is_outdoor = any(pattern in entity_lower or pattern in name_lower 
-                        for pattern in outdoor_patterns)
-        
-        if is_outdoor:
-            _LOGGER.debug(f"New outdoor {sensor_type} sensor detected: {entity_id}")
-            # Re-evaluate existing indoor sensors for window recommendation creation
-            await self._reevaluate_window_sensors()
+    @callback
+    def _async_flush_entities(self, _now):
+        """Add all queued entities at once."""
+        self._unsub_flush = None
+        entities, self._pending_entities = self._pending_entities, []
+        if entities:
+            self._async_add_entities(entities)
+    
+    async def _async_handle_new_temperature_entity(self, temperature_entity_id):
+        """Handle discovery of a new temperature entity that might complete a pending pair."""
+        # Retry humidity sensors that were added before their temperature sensor
+        for humidity_entity_id in list(self._pending_humidity_sensors):
+            await self._async_handle_new_humidity_entity(humidity_entity_id)
     
     async def _reevaluate_window_sensors(self):
         """Re-evaluate existing indoor sensors to see if window sensors can now be created."""
         _LOGGER.debug("Re-evaluating existing indoor sensors for window recommendation creation")
         
-        # Find outdoor sensors
+        # Find outdoor sensors, rescanning since this is also how a rescan is forced
+        self._outdoor_cache = None
         outdoor_temp, outdoor_humidity = self._find_outdoor_sensors()
         
         if not (outdoor_temp and outdoor_humidity):
@@ -180,7 +364,7 @@ class AbsoluteHumidityDiscovery:
             if not temp_entity_id:
                 continue
                 
-            sensor_key = f"{humidity_entity_id}_{temp_entity_id}"
+            sensor_key = (humidity_entity_id, temp_entity_id)
             
             # Skip if we already created a window sensor for this pair
             if sensor_key in self._created_window_sensors:
@@ -190,27 +374,29 @@ class AbsoluteHumidityDiscovery:
             window_sensor = await self._try_create_window_sensor(humidity_entity_id, temp_entity_id)
             if window_sensor:
                 new_window_sensors.append(window_sensor)
-                _LOGGER.info(f"Created window recommendation sensor after outdoor sensor became available: {window_sensor.name}")
+                _LOGGER.info("Created window recommendation sensor after outdoor sensor became available: %s", window_sensor.name)
         
         if new_window_sensors:
-            self._async_add_entities(new_window_sensors, True)
+            self._async_add_entities(new_window_sensors)
     
     async def _try_create_sensor(self, humidity_entity_id):
         """Try to create an absolute humidity sensor for the given humidity entity."""
         if humidity_entity_id in self._created_sensors:
             return None
         
-        # Skip self-generated absolute humidity sensors to avoid recursive discovery
-        if humidity_entity_id.startswith('sensor.absolute_humidity_'):
-            _LOGGER.debug(f"Skipping self-generated absolute humidity sensor: {humidity_entity_id}")
+        # Skip self-generated sensors to avoid recursive discovery
+        if _is_self_generated(self._hass, humidity_entity_id):
+            _LOGGER.debug("Skipping self-generated sensor: %s", humidity_entity_id)
             return None
         
         temp_entity_id = self._find_matching_temperature_sensor(humidity_entity_id)
         if temp_entity_id:
             temp_state = self._hass.states.get(temp_entity_id)
-            if temp_state and temp_state.attributes.get('device_class') == 'temperature':
-                _LOGGER.debug(f"Creating absolute humidity sensor for humidity: {humidity_entity_id}, temperature: {temp_entity_id}")
+            temp_entry = er.async_get(self._hass).async_get(temp_entity_id)
+            if temp_state and _sensor_device_class(temp_entry, temp_state) == 'temperature':
+                _LOGGER.debug("Creating absolute humidity sensor for humidity: %s, temperature: %s", humidity_entity_id, temp_entity_id)
                 self._created_sensors.add(humidity_entity_id)
+                self._pending_humidity_sensors.discard(humidity_entity_id)
                 
                 # Create the absolute humidity sensor
                 abs_humidity_sensor = AbsoluteHumiditySensor(self._hass, humidity_entity_id, temp_entity_id)
@@ -224,36 +410,49 @@ class AbsoluteHumidityDiscovery:
                 else:
                     return abs_humidity_sensor
         
-        _LOGGER.debug(f"No matching temperature sensor found for humidity sensor: {humidity_entity_id}")
+        _LOGGER.debug("No matching temperature sensor found for humidity sensor: %s", humidity_entity_id)
+        self._pending_humidity_sensors.add(humidity_entity_id)
         return None
     
+    def _index_temperature_sensor(self, temperature_entity_id):
+        """Index a temperature sensor by its base name for pairing with humidity sensors."""
+        self._temperature_sensors.add(temperature_entity_id)
+        base, suffix = _sensor_base_name(temperature_entity_id)
+        if suffix == 'temperature':
+            self._temp_index[base] = temperature_entity_id
+        # Prefer '_temperature' over '_temp' when both exist for the same base name
+        elif suffix == 'temp' and base not in self._temp_index:
+            self._temp_index[base] = temperature_entity_id
+    
     def _find_matching_temperature_sensor(self, humidity_entity_id):
         """Find a matching temperature sensor for the given humidity sensor using various patterns."""
-        patterns = [
-            # Pattern 1: replace '_humidity' with '_temperature'
-            humidity_entity_id.replace('_humidity', '_temperature'),
-            # Pattern 2: replace 'humidity' with 'temperature' anywhere
-            humidity_entity_id.replace('humidity', 'temperature'),
-            # Pattern 3: same base name + '_temp' instead of '_humidity'
-            humidity_entity_id.replace('_humidity', '_temp'),
-            # Pattern 4: same base name + '_temperature' (removing last part)
-            f"{humidity_entity_id.rsplit('_', 1)[0]}_temperature",
-            # Pattern 5: same base name + '_temp' (removing last part)
-            f"{humidity_entity_id.rsplit('_', 1)[0]}_temp",
-            # Pattern 6: same base name without suffix
-            humidity_entity_id.replace('_humidity', ''),
-            # Pattern 7: same base without the suffix and without starting sensor_
-            humidity_entity_id.replace('sensor_', '').replace('_humidity', ''),
-        ]
-        
-        for temp_entity_id in patterns:
-            if temp_entity_id != humidity_entity_id and self._hass.states.get(temp_entity_id):
-                _LOGGER.debug(f"Found potential temperature sensor {temp_entity_id} for humidity sensor {humidity_entity_id}")
+        # Fast path: '{base}_humidity' paired with '{base}_temperature' or '{base}_temp'
+        states_get = self._hass.states.get
+        base, suffix = _sensor_base_name(humidity_entity_id)
+        if suffix == 'humidity':
+            temp_entity_id = self._temp_index.get(base)
+            if temp_entity_id and states_get(temp_entity_id):
                 return temp_entity_id
         
-        return None
+        # Fall back to probing the other supported naming conventions
+        temp_entity_id = next(
+            (c for c in _candidate_temp_ids(humidity_entity_id) if states_get(c)), None
+        )
+        if temp_entity_id:
+            _LOGGER.debug("Found potential temperature sensor %s for humidity sensor %s", temp_entity_id, humidity_entity_id)
+        return temp_entity_id
     
     def _find_outdoor_sensors(self):
+        """Return the outdoor temperature and humidity sensors, scanning only when the cache is stale."""
+        if self._outdoor_cache is None:
+            outdoor_temp, outdoor_humidity = self._scan_outdoor_sensors()
+            # Keep scanning until both are found, a missing sensor may still be loading
+            if not (outdoor_temp and outdoor_humidity):
+                return outdoor_temp, outdoor_humidity
+            self._outdoor_cache = (outdoor_temp, outdoor_humidity)
+        return self._outdoor_cache
+    
+    def _scan_outdoor_sensors(self):
         """Find outdoor temperature and humidity sensors based on configuration or common naming patterns."""
         outdoor_temp = None
         outdoor_humidity = None
@@ -262,85 +461,75 @@ class AbsoluteHumidityDiscovery:
         if self._outdoor_temperature_sensor:
             if self._hass.states.get(self._outdoor_temperature_sensor):
                 outdoor_temp = self._outdoor_temperature_sensor
-                _LOGGER.debug(f"Using configured outdoor temperature sensor: {outdoor_temp}")
+                _LOGGER.debug("Using configured outdoor temperature sensor: %s", outdoor_temp)
             else:
-                _LOGGER.warning(f"Configured outdoor temperature sensor not found: {self._outdoor_temperature_sensor}")
+                _LOGGER.warning("Configured outdoor temperature sensor not found: %s", self._outdoor_temperature_sensor)
         
         if self._outdoor_humidity_sensor:
             if self._hass.states.get(self._outdoor_humidity_sensor):
                 outdoor_humidity = self._outdoor_humidity_sensor
-                _LOGGER.debug(f"Using configured outdoor humidity sensor: {outdoor_humidity}")
+                _LOGGER.debug("Using configured outdoor humidity sensor: %s", outdoor_humidity)
             else:
-                _LOGGER.warning(f"Configured outdoor humidity sensor not found: {self._outdoor_humidity_sensor}")
+                _LOGGER.warning("Configured outdoor humidity sensor not found: %s", self._outdoor_humidity_sensor)
         
         # If both configured sensors are found, return them
         if outdoor_temp and outdoor_humidity:
-            _LOGGER.debug(f"Using configured outdoor sensor pair: temp={outdoor_temp}, humidity={outdoor_humidity}")
+            _LOGGER.debug("Using configured outdoor sensor pair: temp=%s, humidity=%s", outdoor_temp, outdoor_humidity)
             return outdoor_temp, outdoor_humidity
         
         # Fall back to auto-detection if configuration is incomplete
         if not outdoor_temp or not outdoor_humidity:
             _LOGGER.debug("Falling back to auto-detection for missing outdoor sensors...")
             
-            # Common patterns for outdoor sensors
-            outdoor_patterns = [
-                'outdoor', 'outside', 'exterior', 'external', 'weather', 
-                'yard', 'garden', 'patio', 'deck', 'balcony'
-            ]
-            
             _LOGGER.debug("Searching for outdoor sensors...")
             
-            for entity_id in self._hass.states.async_entity_ids('sensor'):
-                state = self._hass.states.get(entity_id)
-                if not state:
-                    continue
-                    
-                entity_lower = entity_id.lower()
-                name_lower = state.attributes.get('friendly_name', '').lower()
-                
-                # Check if this looks like an outdoor sensor
-                is_outdoor = any(pattern in entity_lower or pattern in name_lower 
-                               for pattern in outdoor_patterns)
-                
-                if is_outdoor:
-                    device_class = state.attributes.get('device_class')
-                    if device_class == 'temperature' and not outdoor_temp:
-                        outdoor_temp = entity_id
-                        _LOGGER.debug(f"Found outdoor temperature sensor: {entity_id}")
-                    elif device_class == 'humidity' and not outdoor_humidity:
-                        outdoor_humidity = entity_id
-                        _LOGGER.debug(f"Found outdoor humidity sensor: {entity_id}")
-                        
-                    # Break early if we found both
-                    if outdoor_temp and outdoor_humidity:
-                        break
+            if not outdoor_temp:
+                outdoor_temp = self._find_outdoor_candidate(self._temperature_sensors)
+                if outdoor_temp:
+                    _LOGGER.debug("Found outdoor temperature sensor: %s", outdoor_temp)
+            if not outdoor_humidity:
+                outdoor_humidity = self._find_outdoor_candidate(self._humidity_index)
+                if outdoor_humidity:
+                    _LOGGER.debug("Found outdoor humidity sensor: %s", outdoor_humidity)
         
         if outdoor_temp and outdoor_humidity:
-            _LOGGER.debug(f"Found outdoor sensor pair: temp={outdoor_temp}, humidity={outdoor_humidity}")
+            _LOGGER.debug("Found outdoor sensor pair: temp=%s, humidity=%s", outdoor_temp, outdoor_humidity)
         elif outdoor_temp:
-            _LOGGER.debug(f"Found outdoor temperature sensor only: {outdoor_temp}")
+            _LOGGER.debug("Found outdoor temperature sensor only: %s", outdoor_temp)
         elif outdoor_humidity:
-            _LOGGER.debug(f"Found outdoor humidity sensor only: {outdoor_humidity}")
+            _LOGGER.debug("Found outdoor humidity sensor only: %s", outdoor_humidity)
         else:
             _LOGGER.debug("No outdoor sensors found")
         
         return outdoor_temp, outdoor_humidity
     
+    def _find_outdoor_candidate(self, entity_ids):
+        """Return the first indexed sensor that looks like an outdoor sensor."""
+        states_get = self._hass.states.get
+        # Sorted so the same outdoor sensor is picked on every run
+        for entity_id in sorted(entity_ids):
+            if _is_self_generated(self._hass, entity_id):
+                continue
+            state = states_get(entity_id)
+            if state and _is_outdoor_sensor(entity_id, state):
+                return entity_id
+        return None
+    
     async def _try_create_window_sensor(self, indoor_humidity_entity_id, indoor_temp_entity_id):
         """Try to create a window recommendation sensor for the given indoor sensors."""
-        sensor_key = f"{indoor_humidity_entity_id}_{indoor_temp_entity_id}"
+        sensor_key = (indoor_humidity_entity_id, indoor_temp_entity_id)
         if sensor_key in self._created_window_sensors:
-            _LOGGER.debug(f"Window sensor already exists for {sensor_key}")
+            _LOGGER.debug("Window sensor already exists for %s, %s", indoor_humidity_entity_id, indoor_temp_entity_id)
             return None
         
         outdoor_temp, outdoor_humidity = self._find_outdoor_sensors()
         
         if not outdoor_temp:
-            _LOGGER.debug(f"No outdoor temperature sensor found for window recommendation (indoor: {indoor_humidity_entity_id})")
+            _LOGGER.debug("No outdoor temperature sensor found for window recommendation (indoor: %s)", indoor_humidity_entity_id)
             return None
             
         if not outdoor_humidity:
-            _LOGGER.debug(f"No outdoor humidity sensor found for window recommendation (indoor: {indoor_humidity_entity_id})")
+            _LOGGER.debug("No outdoor humidity sensor found for window recommendation (indoor: %s)", indoor_humidity_entity_id)
             return None
         
         # Find corresponding absolute humidity sensors
@@ -352,9 +541,9 @@ class AbsoluteHumidityDiscovery:
         if outdoor_abs_temp_entity_id:
             outdoor_abs_humidity_entity_id = f"sensor.absolute_humidity_{outdoor_humidity.split('.')[-1]}"
         
-        _LOGGER.debug(f"Creating window recommendation sensor for indoor sensors: {indoor_humidity_entity_id}, {indoor_temp_entity_id}")
-        _LOGGER.debug(f"Using outdoor sensors: {outdoor_humidity}, {outdoor_temp}")
-        _LOGGER.debug(f"Using absolute humidity sensors: indoor={indoor_abs_humidity_entity_id}, outdoor={outdoor_abs_humidity_entity_id}")
+        _LOGGER.debug("Creating window recommendation sensor for indoor sensors: %s, %s", indoor_humidity_entity_id, indoor_temp_entity_id)
+        _LOGGER.debug("Using outdoor sensors: %s, %s", outdoor_humidity, outdoor_temp)
+        _LOGGER.debug("Using absolute humidity sensors: indoor=%s, outdoor=%s", indoor_abs_humidity_entity_id, outdoor_abs_humidity_entity_id)
         
         self._created_window_sensors.add(sensor_key)
         return WindowRecommendationSensor(
@@ -374,7 +563,7 @@ class AbsoluteHumidityDiscovery:
     def _async_add_window_sensor(self, indoor_humidity_entity_id, indoor_temp_entity_id, 
                                 outdoor_humidity_entity_id, outdoor_temp_entity_id):
         """Add a window recommendation sensor via dispatcher signal."""
-        sensor_key = f"{indoor_humidity_entity_id}_{indoor_temp_entity_id}"
+        sensor_key = (indoor_humidity_entity_id, indoor_temp_entity_id)
         if sensor_key not in self._created_window_sensors:
             # Find corresponding absolute humidity sensors
             indoor_abs_humidity_entity_id = f"sensor.absolute_humidity_{indoor_humidity_entity_id.split('.')[-1]}"
@@ -393,14 +582,25 @@ class AbsoluteHumidityDiscovery:
                 self._absolute_humidity_offset,
                 self._absolute_humidity_warning_level
             )
-            self._async_add_entities([sensor], True)
-            _LOGGER.info(f"Manually added window recommendation sensor: {sensor.name}")
+            self._async_add_entities([sensor])
+            _LOGGER.info("Manually added window recommendation sensor: %s", sensor.name)
     
     @callback
     def _async_add_sensor(self, humidity_entity_id, temperature_entity_id):
         """Add a sensor via dispatcher signal."""
-        if humidity_entity_id not in self._created_sensors:
-            self._created_sensors.add(humidity_entity_id)
-            sensor = AbsoluteHumiditySensor(self._hass, humidity_entity_id, temperature_entity_id)
-            self._async_add_entities([sensor], True)
-            _LOGGER.info(f"Manually added absolute humidity sensor: {sensor.name}")
+        # Handle errors here so a bad manual request never propagates into the dispatcher
+        try:
+            if humidity_entity_id not in self._created_sensors:
+                self._created_sensors.add(humidity_entity_id)
+                sensor = AbsoluteHumiditySensor(self._hass, humidity_entity_id, temperature_entity_id)
+                self._async_add_entities([sensor])
+                _LOGGER.info("Manually added absolute humidity sensor: %s", sensor.name)
+        except Exception:
+            _LOGGER.exception("Error manually adding absolute humidity sensor for %s", humidity_entity_id)
+
+
+# Handlers for newly added sensors, keyed by device class
+_DC_DISPATCH = {
+    'humidity': AbsoluteHumidityDiscovery._handle_humidity_added,
+    'temperature': AbsoluteHumidityDiscovery._handle_temperature_added,
+}
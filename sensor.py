@@ -5,7 +5,7 @@ from homeassistant.const import CONF_PLATFORM
 import voluptuous as vol
 import logging
 
-from .const import SIGNAL_ADD_SENSOR, SIGNAL_ADD_WINDOW_SENSOR
+from .const import DOMAIN, SIGNAL_ADD_SENSOR, SIGNAL_ADD_WINDOW_SENSOR
 from .discovery import AbsoluteHumidityDiscovery
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,10 +23,13 @@ PLATFORM_SCHEMA = vol.Schema({
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the absolute humidity platform with dynamic discovery."""
     _LOGGER.debug("Setting up absolute humidity platform with dynamic discovery")
-    _LOGGER.debug(f"Platform config: {config}")
+    _LOGGER.debug("Platform config: %s", config)
+    
+    # Shared so another platform setup does not create the same sensors again
+    created_sensors = hass.data.setdefault(DOMAIN, {}).setdefault("created", set())
     
     # Create and set up the discovery system with configuration
-    discovery = AbsoluteHumidityDiscovery(hass, async_add_entities, config)
+    discovery = AbsoluteHumidityDiscovery(hass, async_add_entities, config, created_sensors)
     await discovery.async_setup()
     
     # Store the discovery instance for potential cleanup
@@ -1,22 +1,88 @@
 """Window Recommendation Sensor class."""
+from __future__ import annotations
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
-import math
+from homeassistant.helpers.event import async_track_state_change_event
+from functools import cached_property
 import logging
 
-from .const import WINDOW_STATE_TOO_WET, WINDOW_STATE_TOO_WARM, WINDOW_STATE_OK_TO_OPEN, WINDOW_STATE_OPENING_RECOMMENDED, DEFAULT_TEMPERATURE_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL
+from .calculation import calculate_absolute_humidity
+from .const import DOMAIN, INVALID_STATES, SIGNAL_ABS_SENSOR_ADDED, WINDOW_STATE_TOO_WET, WINDOW_STATE_TOO_WARM, WINDOW_STATE_OK_TO_OPEN, WINDOW_STATE_OPENING_RECOMMENDED, DEFAULT_TEMPERATURE_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_OFFSET, DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL
 
 _LOGGER = logging.getLogger(__name__)
 
+# Recommendation indexed by (too_wet << 2 | above_warning_level << 1 | too_warm):
+# - too wet: outdoor absolute humidity exceeds indoor by the configured offset,
+#   so opening windows would increase indoor humidity
+# - above warning level: indoor absolute humidity is high enough to recommend opening
+# - too warm: outdoor is warmer than indoor by the configured offset while indoor is comfortable
+# Earlier conditions take precedence, otherwise it's generally OK to open
+_DECISION = (
+    WINDOW_STATE_OK_TO_OPEN,
+    WINDOW_STATE_TOO_WARM,
+    WINDOW_STATE_OPENING_RECOMMENDED,
+    WINDOW_STATE_OPENING_RECOMMENDED,
+    WINDOW_STATE_TOO_WET,
+    WINDOW_STATE_TOO_WET,
+    WINDOW_STATE_TOO_WET,
+    WINDOW_STATE_TOO_WET,
+)
+
+# Icon for each recommendation, the window is shown closed without one
+_ICONS = {
+    WINDOW_STATE_OK_TO_OPEN: "mdi:window-open",
+    WINDOW_STATE_TOO_WET: "mdi:water-alert",
+    WINDOW_STATE_TOO_WARM: "mdi:thermometer-alert",
+    WINDOW_STATE_OPENING_RECOMMENDED: "mdi:window-open-variant",
+}
+
+
+def _safe_float(value) -> float | None:
+    """Return value as a float, or None if it cannot be converted."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
 
 class WindowRecommendationSensor(Entity):
     """Representation of a Window Recommendation sensor."""
     
-    def __init__(self, hass, indoor_humidity_entity_id, indoor_temp_entity_id, 
-                 outdoor_humidity_entity_id, outdoor_temp_entity_id,
-                 indoor_abs_humidity_entity_id=None, outdoor_abs_humidity_entity_id=None,
-                 temperature_offset=DEFAULT_TEMPERATURE_OFFSET, 
-                 absolute_humidity_offset=DEFAULT_ABSOLUTE_HUMIDITY_OFFSET,
-                 absolute_humidity_warning_level=DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL):
+    __slots__ = (
+        "_hass",
+        "_indoor_humidity_entity_id",
+        "_indoor_temp_entity_id",
+        "_outdoor_humidity_entity_id",
+        "_outdoor_temp_entity_id",
+        "_indoor_abs_humidity_entity_id",
+        "_outdoor_abs_humidity_entity_id",
+        "_temperature_offset",
+        "_absolute_humidity_offset",
+        "_absolute_humidity_warning_level",
+        "_temperature_offset_str",
+        "_absolute_humidity_offset_str",
+        "_absolute_humidity_warning_level_str",
+        "_state",
+        "_indoor_temp_value",
+        "_outdoor_temp_value",
+        "_indoor_abs_humidity_value",
+        "_outdoor_abs_humidity_value",
+        "_indoor_abs_source",
+        "_outdoor_abs_source",
+        "_tracked_abs_sources",
+        "_unsub_abs_sources",
+    )
+    
+    _attr_should_poll = False
+    
+    def __init__(self, hass: HomeAssistant, indoor_humidity_entity_id: str, indoor_temp_entity_id: str,
+                 outdoor_humidity_entity_id: str, outdoor_temp_entity_id: str,
+                 indoor_abs_humidity_entity_id: str | None = None, outdoor_abs_humidity_entity_id: str | None = None,
+                 temperature_offset: float = DEFAULT_TEMPERATURE_OFFSET,
+                 absolute_humidity_offset: float = DEFAULT_ABSOLUTE_HUMIDITY_OFFSET,
+                 absolute_humidity_warning_level: float = DEFAULT_ABSOLUTE_HUMIDITY_WARNING_LEVEL) -> None:
         self._hass = hass
         self._indoor_humidity_entity_id = indoor_humidity_entity_id
         self._indoor_temp_entity_id = indoor_temp_entity_id
@@ -35,48 +101,50 @@ class WindowRecommendationSensor(Entity):
         self._indoor_abs_humidity_value = None
         self._outdoor_abs_humidity_value = None
         
-        # Create a user-friendly name
-        indoor_humidity_name = hass.states.get(indoor_humidity_entity_id).attributes.get('friendly_name', indoor_humidity_entity_id)
-        location_name = indoor_humidity_name.replace('Humidity', '').strip()
-        self._name = f"{location_name} window recommendation"
-        self._unique_id = f"window_recommendation_{indoor_humidity_entity_id}"
+        # Absolute humidity sensors used by the last update, reused for the attributes
+        self._indoor_abs_source = None
+        self._outdoor_abs_source = None
+        
+        # Subscription to those sensors, renewed whenever they change
+        self._tracked_abs_sources = ()
+        self._unsub_abs_sources = None
+        
+        # The offsets never change, so format them for the attributes only once
+        self._temperature_offset_str = f"{temperature_offset}°C"
+        self._absolute_humidity_offset_str = f"{absolute_humidity_offset} g/m³"
+        self._absolute_humidity_warning_level_str = f"{absolute_humidity_warning_level} g/m³"
         
-        _LOGGER.debug(f"Initialized WindowRecommendationSensor: {self._name}")
-        _LOGGER.debug(f"Using absolute humidity sensors: indoor={indoor_abs_humidity_entity_id}, outdoor={outdoor_abs_humidity_entity_id}")
-        _LOGGER.debug(f"Using offsets: temperature={temperature_offset}°C, absolute_humidity={absolute_humidity_offset}g/m³, warning_level={absolute_humidity_warning_level}g/m³")
+        self._attr_unique_id = f"window_recommendation_{indoor_humidity_entity_id}"
+        
+        _LOGGER.debug("Initialized WindowRecommendationSensor for %s", indoor_humidity_entity_id)
+        _LOGGER.debug("Using absolute humidity sensors: indoor=%s, outdoor=%s",
+                      indoor_abs_humidity_entity_id, outdoor_abs_humidity_entity_id)
+        _LOGGER.debug("Using offsets: temperature=%s°C, absolute_humidity=%sg/m³, warning_level=%sg/m³",
+                      temperature_offset, absolute_humidity_offset, absolute_humidity_warning_level)
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self._name
-    
-    @property
-    def unique_id(self):
-        """Return a unique ID for this sensor."""
-        return self._unique_id
+    @cached_property
+    def name(self) -> str:
+        """Return a user-friendly name, resolved on first access."""
+        state = self._hass.states.get(self._indoor_humidity_entity_id)
+        indoor_humidity_name = (
+            state.attributes.get('friendly_name', self._indoor_humidity_entity_id)
+            if state else self._indoor_humidity_entity_id
+        )
+        location_name = indoor_humidity_name.replace('Humidity', '').strip()
+        return f"{location_name} window recommendation"
 
     @property
-    def state(self):
+    def state(self) -> str | None:
         """Return the state of the sensor."""
         return self._state
 
     @property
-    def icon(self):
+    def icon(self) -> str:
         """Return the icon for the sensor."""
-        if self._state == WINDOW_STATE_OK_TO_OPEN:
-            return "mdi:window-open"
-        elif self._state == WINDOW_STATE_TOO_WET:
-            return "mdi:water-alert"
-        elif self._state == WINDOW_STATE_TOO_WARM:
-            return "mdi:thermometer-alert"
-        elif self._state == WINDOW_STATE_OPENING_RECOMMENDED:
-            return "mdi:window-open-variant"
-        else:
-            return "mdi:window-closed"
+        return _ICONS.get(self._state, "mdi:window-closed")
     
-    @property
-    def extra_state_attributes(self):
-        """Return additional state attributes."""
+    def _build_attributes(self) -> dict[str, str]:
+        """Return the state attributes, built once per recalculation."""
         attrs = {
             "indoor_humidity": self._indoor_humidity_entity_id,
             "indoor_temperature": self._indoor_temp_entity_id,
@@ -91,44 +159,31 @@ class WindowRecommendationSensor(Entity):
             attrs["outdoor_absolute_humidity"] = self._outdoor_abs_humidity_entity_id
         
         # Add current values if available
-        indoor_humidity = self._hass.states.get(self._indoor_humidity_entity_id)
-        indoor_temp = self._hass.states.get(self._indoor_temp_entity_id)
-        outdoor_humidity = self._hass.states.get(self._outdoor_humidity_entity_id)
-        outdoor_temp = self._hass.states.get(self._outdoor_temp_entity_id)
+        get = self._hass.states.get
+        indoor_humidity = get(self._indoor_humidity_entity_id)
+        indoor_temp = get(self._indoor_temp_entity_id)
+        outdoor_humidity = get(self._outdoor_humidity_entity_id)
+        outdoor_temp = get(self._outdoor_temp_entity_id)
         
-        if indoor_humidity and indoor_humidity.state not in ['unknown', 'unavailable']:
+        if indoor_humidity and indoor_humidity.state not in INVALID_STATES:
             attrs["indoor_humidity_value"] = f"{indoor_humidity.state}%"
-        if indoor_temp and indoor_temp.state not in ['unknown', 'unavailable']:
+        if indoor_temp and indoor_temp.state not in INVALID_STATES:
             attrs["indoor_temperature_value"] = f"{indoor_temp.state}°C"
-        if outdoor_humidity and outdoor_humidity.state not in ['unknown', 'unavailable']:
+        if outdoor_humidity and outdoor_humidity.state not in INVALID_STATES:
             attrs["outdoor_humidity_value"] = f"{outdoor_humidity.state}%"
-        if outdoor_temp and outdoor_temp.state not in ['unknown', 'unavailable']:
+        if outdoor_temp and outdoor_temp.state not in INVALID_STATES:
             attrs["outdoor_temperature_value"] = f"{outdoor_temp.state}°C"
             
-        # Add absolute humidity values if available
-        # Try to find indoor absolute humidity sensor
-        indoor_abs_sensor = self._find_absolute_humidity_sensor(self._indoor_humidity_entity_id)
-        if indoor_abs_sensor:
-            indoor_abs_state = self._hass.states.get(indoor_abs_sensor)
-            if indoor_abs_state and indoor_abs_state.state not in ['unknown', 'unavailable']:
+        # Add absolute humidity values from the sensors the last update resolved
+        if self._indoor_abs_source:
+            indoor_abs_state = get(self._indoor_abs_source)
+            if indoor_abs_state and indoor_abs_state.state not in INVALID_STATES:
                 attrs["indoor_absolute_humidity_value"] = f"{indoor_abs_state.state} g/m³"
-        elif self._indoor_abs_humidity_entity_id:
-            # Fallback to original method
-            indoor_abs_humidity = self._hass.states.get(self._indoor_abs_humidity_entity_id)
-            if indoor_abs_humidity and indoor_abs_humidity.state not in ['unknown', 'unavailable']:
-                attrs["indoor_absolute_humidity_value"] = f"{indoor_abs_humidity.state} g/m³"
                 
-        # Try to find outdoor absolute humidity sensor
-        outdoor_abs_sensor = self._find_absolute_humidity_sensor(self._outdoor_humidity_entity_id)
-        if outdoor_abs_sensor:
-            outdoor_abs_state = self._hass.states.get(outdoor_abs_sensor)
-            if outdoor_abs_state and outdoor_abs_state.state not in ['unknown', 'unavailable']:
+        if self._outdoor_abs_source:
+            outdoor_abs_state = get(self._outdoor_abs_source)
+            if outdoor_abs_state and outdoor_abs_state.state not in INVALID_STATES:
                 attrs["outdoor_absolute_humidity_value"] = f"{outdoor_abs_state.state} g/m³"
-        elif self._outdoor_abs_humidity_entity_id:
-            # Fallback to original method
-            outdoor_abs_humidity = self._hass.states.get(self._outdoor_abs_humidity_entity_id)
-            if outdoor_abs_humidity and outdoor_abs_humidity.state not in ['unknown', 'unavailable']:
-                attrs["outdoor_absolute_humidity_value"] = f"{outdoor_abs_humidity.state} g/m³"
         
         # Add temperature and absolute humidity differences if values are available
         if (self._indoor_temp_value is not None and self._outdoor_temp_value is not None):
@@ -140,131 +195,166 @@ class WindowRecommendationSensor(Entity):
             attrs["absolute_humidity_difference"] = f"{abs_humidity_diff:+.2f} g/m³"
         
         # Add configuration offsets
-        attrs["temperature_offset"] = f"{self._temperature_offset}°C"
-        attrs["absolute_humidity_offset"] = f"{self._absolute_humidity_offset} g/m³"
-        attrs["absolute_humidity_warning_level"] = f"{self._absolute_humidity_warning_level} g/m³"
+        attrs["temperature_offset"] = self._temperature_offset_str
+        attrs["absolute_humidity_offset"] = self._absolute_humidity_offset_str
+        attrs["absolute_humidity_warning_level"] = self._absolute_humidity_warning_level_str
         
         return attrs
     
     @property
-    def available(self):
+    def available(self) -> bool:
         """Return True if entity is available."""
-        indoor_humidity = self._hass.states.get(self._indoor_humidity_entity_id)
-        indoor_temp = self._hass.states.get(self._indoor_temp_entity_id)
-        outdoor_humidity = self._hass.states.get(self._outdoor_humidity_entity_id)
-        outdoor_temp = self._hass.states.get(self._outdoor_temp_entity_id)
+        get = self._hass.states.get
+        indoor_humidity = get(self._indoor_humidity_entity_id)
+        indoor_temp = get(self._indoor_temp_entity_id)
+        outdoor_humidity = get(self._outdoor_humidity_entity_id)
+        outdoor_temp = get(self._outdoor_temp_entity_id)
         
         return (indoor_humidity is not None and 
                 indoor_temp is not None and
                 outdoor_humidity is not None and
                 outdoor_temp is not None and
-                indoor_humidity.state not in ['unknown', 'unavailable'] and
-                indoor_temp.state not in ['unknown', 'unavailable'] and
-                outdoor_humidity.state not in ['unknown', 'unavailable'] and
-                outdoor_temp.state not in ['unknown', 'unavailable'])
+                indoor_humidity.state not in INVALID_STATES and
+                indoor_temp.state not in INVALID_STATES and
+                outdoor_humidity.state not in INVALID_STATES and
+                outdoor_temp.state not in INVALID_STATES)
 
-    async def async_update(self):
-        """Update the sensor state."""
-        _LOGGER.debug(f"Updating window recommendation sensor {self._name}")
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the source sensors and calculate the initial state."""
+        self.async_on_remove(
+            async_track_state_change_event(
+                self._hass,
+                [
+                    self._indoor_humidity_entity_id,
+                    self._indoor_temp_entity_id,
+                    self._outdoor_humidity_entity_id,
+                    self._outdoor_temp_entity_id,
+                ],
+                self._async_source_changed,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(self._hass, SIGNAL_ABS_SENSOR_ADDED, self._async_abs_sensor_added)
+        )
+        
+        self._update_state()
+        self._track_abs_sources()
+        self._attr_extra_state_attributes = self._build_attributes()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop following the absolute humidity sensors."""
+        if self._unsub_abs_sources:
+            self._unsub_abs_sources()
+            self._unsub_abs_sources = None
+
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        """Recalculate when one of the source sensors changes."""
+        # Attribute-only changes leave every value the recommendation uses untouched
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        
+        self._async_recalculate()
+
+    @callback
+    def _async_abs_sensor_added(self, humidity_entity_id: str) -> None:
+        """Pick up an absolute humidity sensor added for one of our humidity sensors."""
+        if humidity_entity_id in (self._indoor_humidity_entity_id, self._outdoor_humidity_entity_id):
+            self._async_recalculate()
+
+    @callback
+    def _async_recalculate(self) -> None:
+        """Recalculate, follow the resolved absolute humidity sensors and write the state."""
+        self._update_state()
+        self._track_abs_sources()
+        self._attr_extra_state_attributes = self._build_attributes()
+        self.async_write_ha_state()
+
+    def _track_abs_sources(self) -> None:
+        """Follow the absolute humidity sensors the last update resolved."""
+        # They can be added after this sensor and may recalculate after it for the same
+        # source change, so their own updates have to trigger a recalculation here too
+        sources = tuple(
+            entity_id for entity_id in (self._indoor_abs_source, self._outdoor_abs_source) if entity_id
+        )
+        if sources == self._tracked_abs_sources:
+            return
+        
+        if self._unsub_abs_sources:
+            self._unsub_abs_sources()
+            self._unsub_abs_sources = None
+        self._tracked_abs_sources = sources
+        if sources:
+            self._unsub_abs_sources = async_track_state_change_event(
+                self._hass, sources, self._async_source_changed
+            )
+
+    def _update_state(self) -> None:
+        """Update the sensor state from the current source states."""
+        _LOGGER.debug("Updating window recommendation sensor %s", self.name)
         
         # Get all sensor states
-        indoor_humidity = self._hass.states.get(self._indoor_humidity_entity_id)
-        indoor_temp = self._hass.states.get(self._indoor_temp_entity_id)
-        outdoor_humidity = self._hass.states.get(self._outdoor_humidity_entity_id)
-        outdoor_temp = self._hass.states.get(self._outdoor_temp_entity_id)
+        get = self._hass.states.get
+        indoor_humidity = get(self._indoor_humidity_entity_id)
+        indoor_temp = get(self._indoor_temp_entity_id)
+        outdoor_humidity = get(self._outdoor_humidity_entity_id)
+        outdoor_temp = get(self._outdoor_temp_entity_id)
 
         # Check if all states are available
-        if not all([indoor_humidity, indoor_temp, outdoor_humidity, outdoor_temp]):
-            _LOGGER.warning(f"Some entities are None for {self._name}")
+        if indoor_humidity is None or indoor_temp is None or outdoor_humidity is None or outdoor_temp is None:
+            _LOGGER.warning("Some entities are None for %s", self.name)
             return
         
         # Check if states are valid
-        states = [indoor_humidity, indoor_temp, outdoor_humidity, outdoor_temp]
-        if any(state.state in ['unknown', 'unavailable'] for state in states):
-            _LOGGER.debug(f"Some entities are unavailable for {self._name}")
+        if (indoor_humidity.state in INVALID_STATES or indoor_temp.state in INVALID_STATES or
+                outdoor_humidity.state in INVALID_STATES or outdoor_temp.state in INVALID_STATES):
+            _LOGGER.debug("Some entities are unavailable for %s", self.name)
             return
 
         try:
-            indoor_rh = float(indoor_humidity.state)
-            indoor_temp_c = float(indoor_temp.state)
-            outdoor_rh = float(outdoor_humidity.state)
-            outdoor_temp_c = float(outdoor_temp.state)
+            indoor_rh = _safe_float(indoor_humidity.state)
+            indoor_temp_c = _safe_float(indoor_temp.state)
+            outdoor_rh = _safe_float(outdoor_humidity.state)
+            outdoor_temp_c = _safe_float(outdoor_temp.state)
+            
+            if indoor_rh is None or indoor_temp_c is None or outdoor_rh is None or outdoor_temp_c is None:
+                _LOGGER.error("Invalid sensor values for %s", self.name)
+                self._reset_values()
+                return
             
             # Validate ranges
-            if not all(0 <= rh <= 100 for rh in [indoor_rh, outdoor_rh]):
-                _LOGGER.warning(f"Humidity values out of range for {self._name}")
+            if not (0 <= indoor_rh <= 100 and 0 <= outdoor_rh <= 100):
+                _LOGGER.warning("Humidity values out of range for %s", self.name)
                 return
                 
-            if not all(-40 <= temp <= 80 for temp in [indoor_temp_c, outdoor_temp_c]):
-                _LOGGER.warning(f"Temperature values out of range for {self._name}")
+            if not (-40 <= indoor_temp_c <= 80 and -40 <= outdoor_temp_c <= 80):
+                _LOGGER.warning("Temperature values out of range for %s", self.name)
                 return
             
-            _LOGGER.debug(f"Calculating window recommendation for {self._name}: "
-                         f"Indoor: {indoor_temp_c}°C, {indoor_rh}% RH; "
-                         f"Outdoor: {outdoor_temp_c}°C, {outdoor_rh}% RH")
+            _LOGGER.debug("Calculating window recommendation for %s: "
+                          "Indoor: %s°C, %s%% RH; Outdoor: %s°C, %s%% RH",
+                          self.name, indoor_temp_c, indoor_rh, outdoor_temp_c, outdoor_rh)
 
             # Try to get absolute humidity values directly from sensors first
-            indoor_abs_humidity = None
-            outdoor_abs_humidity = None
-
-            _LOGGER.debug(f"Checking absolute humidity sensors if available: {self._indoor_abs_humidity_entity_id}, {self._outdoor_abs_humidity_entity_id}")
-
-            # Try to find indoor absolute humidity sensor
-            indoor_abs_sensor = self._find_absolute_humidity_sensor(self._indoor_humidity_entity_id)
-            if indoor_abs_sensor:
-                indoor_abs_state = self._hass.states.get(indoor_abs_sensor)
-                _LOGGER.debug(f"Found indoor absolute humidity sensor: {indoor_abs_sensor} with state {indoor_abs_state.state if indoor_abs_state else 'None'}")
-                if indoor_abs_state and indoor_abs_state.state not in ['unknown', 'unavailable']:
-                    try:
-                        indoor_abs_humidity = float(indoor_abs_state.state)
-                        _LOGGER.debug(f"Using indoor absolute humidity sensor: {indoor_abs_humidity} g/m³")
-                    except ValueError:
-                        pass
-            elif self._indoor_abs_humidity_entity_id:
-                # Fallback to original method
-                indoor_abs_state = self._hass.states.get(self._indoor_abs_humidity_entity_id)
-                _LOGGER.debug(f"Checking indoor absolute humidity sensor (fallback): {self._indoor_abs_humidity_entity_id} {indoor_abs_state.state if indoor_abs_state else 'None'}")
-                if indoor_abs_state and indoor_abs_state.state not in ['unknown', 'unavailable']:
-                    try:
-                        indoor_abs_humidity = float(indoor_abs_state.state)
-                        _LOGGER.debug(f"Using indoor absolute humidity sensor (fallback): {indoor_abs_humidity} g/m³")
-                    except ValueError:
-                        pass
-                        
-            # Try to find outdoor absolute humidity sensor
-            outdoor_abs_sensor = self._find_absolute_humidity_sensor(self._outdoor_humidity_entity_id)
-            if outdoor_abs_sensor:
-                outdoor_abs_state = self._hass.states.get(outdoor_abs_sensor)
-                _LOGGER.debug(f"Found outdoor absolute humidity sensor: {outdoor_abs_sensor} with state {outdoor_abs_state.state if outdoor_abs_state else 'None'}")
-                if outdoor_abs_state and outdoor_abs_state.state not in ['unknown', 'unavailable']:
-                    try:
-                        outdoor_abs_humidity = float(outdoor_abs_state.state)
-                        _LOGGER.debug(f"Using outdoor absolute humidity sensor: {outdoor_abs_humidity} g/m³")
-                    except ValueError:
-                        pass
-            elif self._outdoor_abs_humidity_entity_id:
-                # Fallback to original method  
-                outdoor_abs_state = self._hass.states.get(self._outdoor_abs_humidity_entity_id)
-                _LOGGER.debug(f"Checking outdoor absolute humidity sensor (fallback): {self._outdoor_abs_humidity_entity_id} {outdoor_abs_state.state if outdoor_abs_state else 'None'}")
-                if outdoor_abs_state and outdoor_abs_state.state not in ['unknown', 'unavailable']:
-                    try:
-                        outdoor_abs_humidity = float(outdoor_abs_state.state)
-                        _LOGGER.debug(f"Using outdoor absolute humidity sensor (fallback): {outdoor_abs_humidity} g/m³")
-                    except ValueError:
-                        pass
+            _LOGGER.debug("Checking absolute humidity sensors if available: %s, %s",
+                          self._indoor_abs_humidity_entity_id, self._outdoor_abs_humidity_entity_id)
+            self._indoor_abs_source, indoor_abs_humidity = self._resolve_abs_humidity(
+                self._indoor_humidity_entity_id, self._indoor_abs_humidity_entity_id
+            )
+            self._outdoor_abs_source, outdoor_abs_humidity = self._resolve_abs_humidity(
+                self._outdoor_humidity_entity_id, self._outdoor_abs_humidity_entity_id
+            )
 
             # Calculate absolute humidity if sensors not available
-            def calc_abs_humidity(temp_c, rh):
-                saturation_vapor_pressure = 6.112 * math.exp((17.67 * temp_c) / (temp_c + 243.5))
-                return (saturation_vapor_pressure * rh * 2.1674) / (273.15 + temp_c)
-            
             if indoor_abs_humidity is None:
-                indoor_abs_humidity = calc_abs_humidity(indoor_temp_c, indoor_rh)
-                _LOGGER.debug(f"Calculated indoor absolute humidity: {indoor_abs_humidity} g/m³")
+                indoor_abs_humidity = calculate_absolute_humidity(indoor_temp_c, indoor_rh)
+                _LOGGER.debug("Calculated indoor absolute humidity: %s g/m³", indoor_abs_humidity)
                 
             if outdoor_abs_humidity is None:
-                outdoor_abs_humidity = calc_abs_humidity(outdoor_temp_c, outdoor_rh)
-                _LOGGER.debug(f"Calculated outdoor absolute humidity: {outdoor_abs_humidity} g/m³")
+                outdoor_abs_humidity = calculate_absolute_humidity(outdoor_temp_c, outdoor_rh)
+                _LOGGER.debug("Calculated outdoor absolute humidity: %s g/m³", outdoor_abs_humidity)
             
             # Store values for use in attributes
             self._indoor_temp_value = indoor_temp_c
@@ -272,62 +362,67 @@ class WindowRecommendationSensor(Entity):
             self._indoor_abs_humidity_value = indoor_abs_humidity
             self._outdoor_abs_humidity_value = outdoor_abs_humidity
             
-            # Determine recommendation based on absolute humidity comparison
-            # If outdoor absolute humidity is higher than indoor by the configured offset, opening windows would increase indoor humidity
-            if outdoor_abs_humidity > indoor_abs_humidity + self._absolute_humidity_offset:
-                self._state = WINDOW_STATE_TOO_WET
-            # Check if indoor absolute humidity is above the warning level first
-            elif indoor_abs_humidity > self._absolute_humidity_warning_level:
-                self._state = WINDOW_STATE_OPENING_RECOMMENDED
-            # If outdoor temperature is significantly higher than indoor by the configured offset and indoor is comfortable
-            elif outdoor_temp_c > indoor_temp_c + self._temperature_offset and indoor_temp_c < 24:
-                self._state = WINDOW_STATE_TOO_WARM
-            # Otherwise, it's generally OK to open
-            else:
-                self._state = WINDOW_STATE_OK_TO_OPEN
+            # Thresholds for the decision below
+            abs_threshold = indoor_abs_humidity + self._absolute_humidity_offset
+            temp_threshold = indoor_temp_c + self._temperature_offset
+            warning_level = self._absolute_humidity_warning_level
             
-            _LOGGER.debug(f"Window recommendation for {self._name}: {self._state} "
-                         f"(Indoor AH: {indoor_abs_humidity:.2f}, Outdoor AH: {outdoor_abs_humidity:.2f}, "
-                         f"Temp offset: {self._temperature_offset}°C, AH offset: {self._absolute_humidity_offset}g/m³, "
-                         f"AH warning level: {self._absolute_humidity_warning_level}g/m³)")
+            # Determine recommendation based on absolute humidity comparison, see _DECISION
+            too_wet = outdoor_abs_humidity > abs_threshold
+            above_warning = indoor_abs_humidity > warning_level
+            too_warm = outdoor_temp_c > temp_threshold and indoor_temp_c < 24
+            self._state = _DECISION[too_wet << 2 | above_warning << 1 | too_warm]
+            
+            _LOGGER.debug("Window recommendation for %s: %s "
+                          "(Indoor AH: %.2f, Outdoor AH: %.2f, "
+                          "Temp offset: %s°C, AH offset: %sg/m³, AH warning level: %sg/m³)",
+                          self.name, self._state, indoor_abs_humidity, outdoor_abs_humidity,
+                          self._temperature_offset, self._absolute_humidity_offset,
+                          self._absolute_humidity_warning_level)
             
-        except ValueError as e:
-            _LOGGER.error(f"Invalid sensor values for {self._name}: {e}")
-            self._state = None
-            self._indoor_temp_value = None
-            self._outdoor_temp_value = None
-            self._indoor_abs_humidity_value = None
-            self._outdoor_abs_humidity_value = None
         except Exception as e:
-            _LOGGER.error(f"Error updating window recommendation sensor {self._name}: {e}")
-            self._state = None
-            self._indoor_temp_value = None
-            self._outdoor_temp_value = None
-            self._indoor_abs_humidity_value = None
-            self._outdoor_abs_humidity_value = None
+            _LOGGER.error("Error updating window recommendation sensor %s: %s", self.name, e)
+            self._reset_values()
+    
+    def _reset_values(self) -> None:
+        """Clear the recommendation and the values shown in the attributes."""
+        self._state = None
+        self._indoor_temp_value = None
+        self._outdoor_temp_value = None
+        self._indoor_abs_humidity_value = None
+        self._outdoor_abs_humidity_value = None
     
-    def _find_absolute_humidity_sensor(self, humidity_entity_id):
+    def _resolve_abs_humidity(
+        self, humidity_entity_id: str, fallback_abs_id: str | None
+    ) -> tuple[str | None, float | None]:
+        """Return the absolute humidity sensor to use and its value, if it has one."""
+        abs_entity_id = self._find_absolute_humidity_sensor(humidity_entity_id) or fallback_abs_id
+        if not abs_entity_id:
+            return None, None
+        
+        abs_state = self._hass.states.get(abs_entity_id)
+        _LOGGER.debug("Checking absolute humidity sensor %s for %s with state %s",
+                      abs_entity_id, humidity_entity_id, abs_state and abs_state.state)
+        if abs_state is None or abs_state.state in INVALID_STATES:
+            return abs_entity_id, None
+        return abs_entity_id, _safe_float(abs_state.state)
+    
+    def _find_absolute_humidity_sensor(self, humidity_entity_id: str | None) -> str | None:
         """Find the corresponding absolute humidity sensor for a given humidity sensor."""
         if not humidity_entity_id:
             return None
             
-        _LOGGER.debug(f"Looking for absolute humidity sensor for: {humidity_entity_id}")
-        
-        # Search through all sensor entities to find one with matching source_humidity attribute
-        for entity_id in self._hass.states.async_entity_ids('sensor'):
-            if entity_id.startswith('sensor.') and 'absolute_humidity' in entity_id.lower():
-                state = self._hass.states.get(entity_id)
-                if state and state.attributes:
-                    source_humidity = state.attributes.get('source_humidity')
-                    if source_humidity == humidity_entity_id:
-                        _LOGGER.debug(f"Found absolute humidity sensor {entity_id} for humidity sensor {humidity_entity_id}")
-                        return entity_id
+        # Absolute humidity sensors register themselves by their source humidity sensor
+        entity_id = self._hass.data.get(DOMAIN, {}).get("abs_sensors", {}).get(humidity_entity_id)
+        if entity_id:
+            _LOGGER.debug("Found absolute humidity sensor %s for humidity sensor %s", entity_id, humidity_entity_id)
+            return entity_id
         
-        # Also try the original expected pattern as fallback
+        # Fall back to the expected pattern for sensors that are not registered
         expected_entity_id = f"sensor.absolute_humidity_{humidity_entity_id.split('.')[-1]}"
         if self._hass.states.get(expected_entity_id):
-            _LOGGER.debug(f"Found absolute humidity sensor using expected pattern: {expected_entity_id}")
+            _LOGGER.debug("Found absolute humidity sensor using expected pattern: %s", expected_entity_id)
             return expected_entity_id
             
-        _LOGGER.debug(f"No absolute humidity sensor found for: {humidity_entity_id}")
+        _LOGGER.debug("No absolute humidity sensor found for: %s", humidity_entity_id)
         return None